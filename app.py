@@ -1,125 +1,268 @@
 import streamlit as st
 import pandas as pd
 import io
-from fractions import Fraction
-from openpyxl import Workbook
+import os
+from concurrent.futures import ProcessPoolExecutor
 
-# Constants
-KANAL_TO_MARLA = 20
-MARLA_TO_SARSAI = 9
-KANAL_TO_ACRE = 0.125
-KILAS_IN_KANAL = 8
+from cache import IncrementalShares, ResultCache, content_key
+from engine import DETAIL_COLUMNS, compute_shares, summarize_owners
+from export import parquet_available, to_csv_bytes, to_excel_bytes, to_parquet_bytes
+from ingest import MAX_ERRORS, PREVIEW_ROWS, iter_upload_chunks, stream_upload
+from report import render_pdf, report_html_bytes
+from store import HOLDING_COLUMNS, LandStore, holdings_summary
+from timing import StageTimer
 
 st.set_page_config(page_title="Land Share Calculator", layout="wide")
 st.title("🧮 Punjab Rural Land Share Calculator")
 
-# Area breakdown utility
-def breakdown_area(share_kanal):
-    kila = int(share_kanal // KILAS_IN_KANAL)
-    kanal_remain = share_kanal % KILAS_IN_KANAL
-    kanal = int(kanal_remain)
-    marla_fraction = (kanal_remain - kanal) * KANAL_TO_MARLA
-    marla = int(marla_fraction)
-    sarshai = round((marla_fraction - marla) * MARLA_TO_SARSAI)
-    return kila, kanal, marla, sarshai
-
-# Excel exporter
-def to_excel_bytes(df1, df2):
-    output = io.BytesIO()
-    writer = pd.ExcelWriter(output, engine='openpyxl')
-    df1.to_excel(writer, index=False, sheet_name='Detailed Output')
-    df2.to_excel(writer, index=False, sheet_name='Owner Summary')
-    writer.close()
-    output.seek(0)
-    return output
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+@st.cache_resource
+def get_report_pool():
+    return ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2))
+
+@st.cache_resource
+def get_land_store():
+    return LandStore()
+
+def compute_upload(data, timer):
+    with timer.stage("ingest (read_excel)"):
+        frame = pd.read_excel(io.BytesIO(data))
+    try:
+        with timer.stage("compute shares"):
+            detail, errors = compute_shares(frame)
+    except KeyError as e:
+        return {"frame": frame, "error": e}
+    with timer.stage("owner summary"):
+        summary = summarize_owners(detail)
+    return {"frame": frame, "detail": detail, "errors": errors, "summary": summary}
+
+def timed_stream(data, preview_rows):
+    with timer.stage("streaming ingest + compute"):
+        return stream_upload(io.BytesIO(data), preview_rows=preview_rows)
+
+def cached(key, compute, timer):
+    with timer.stage("result cache lookup"):
+        entry = result_cache.get(key)
+    return entry if entry is not None else result_cache.put(key, compute())
+
+def export_for(key, name, build):
+    entry = result_cache.get(key) or {}
+    if name not in entry:
+        entry = result_cache.update(key, **{name: build()})
+    return entry[name]
+
+def detail_chunks(data):
+    """Detail table of an uploaded workbook, recomputed one chunk at a time."""
+    return (compute_shares(chunk)[0] for chunk in iter_upload_chunks(io.BytesIO(data)))
+
+def download_buttons(key, detail, summary):
+    # Files are built only when a button is clicked, then cached with the result.
+    # ``detail`` may be a callable returning detail chunks (streaming mode).
+    def rows():
+        chunks = detail() if callable(detail) else [detail]
+        return (chunk[DETAIL_COLUMNS] for chunk in chunks)
+
+    exports = [
+        ("📥 Download Results (Excel)", "xlsx", "land_share_results.xlsx",
+         lambda: to_excel_bytes(rows(), summary).getvalue()),
+        ("Detailed Output (CSV)", "detail_csv", "land_share_detail.csv", lambda: to_csv_bytes(rows())),
+        ("Owner Summary (CSV)", "summary_csv", "land_share_summary.csv", lambda: to_csv_bytes(summary)),
+    ]
+    if parquet_available():
+        exports += [
+            ("Detailed Output (Parquet)", "detail_parquet", "land_share_detail.parquet",
+             lambda: to_parquet_bytes(rows())),
+            ("Owner Summary (Parquet)", "summary_parquet", "land_share_summary.parquet",
+             lambda: to_parquet_bytes(summary)),
+        ]
+    cols = st.columns(len(exports))
+    for col, (label, name, file_name, build) in zip(cols, exports):
+        with col:
+            st.download_button(label, data=lambda name=name, build=build: export_for(key, name, build),
+                               file_name=file_name, key=f"download_{name}")
+
+def report_section(key, detail):
+    st.subheader("🧾 Land Share Report")
+    cols = st.columns(2)
+    with cols[0]:
+        st.download_button("Download Report (HTML)", data=lambda: export_for(key, "report_html", lambda: report_html_bytes(detail)),
+                           file_name="land_share_report.html", mime="text/html", key="download_report_html")
+    with cols[1]:
+        # PDFs render in a worker process; the page only polls the job. A
+        # finished job's bytes move into the result cache and the job is dropped.
+        jobs = st.session_state.setdefault("pdf_jobs", {})
+        job = jobs.get(key)
+        if job is not None and job.done():
+            del jobs[key]
+            if job.exception() is not None:
+                st.error(f"PDF report failed: {job.exception()}")
+            else:
+                result_cache.update(key, report_pdf=job.result())
+        pdf = (result_cache.get(key) or {}).get("report_pdf")
+        if pdf is not None:
+            st.download_button("📄 Download Report (PDF)", data=pdf, file_name="land_share_report.pdf",
+                               mime="application/pdf", key="download_report_pdf")
+        elif key in jobs:
+            st.info("PDF report is being generated…")
+            st.button("Refresh")
+        elif st.button("Generate Report (PDF)"):
+            jobs[key] = get_report_pool().submit(render_pdf, detail)
+            st.rerun()
+
+def save_to_index(default_source, details):
+    store = get_land_store()
+    cols = st.columns([3, 1])
+    with cols[0]:
+        source = st.text_input("Source / village name", value=default_source, key=f"index_source_{default_source}",
+                               help="Holdings are indexed under this name.").strip()
+    existing = store.sources()
+    existing = existing[existing["Source"] == source]
+    if len(existing):
+        st.warning(f"Saving replaces the {existing['Rows'].iloc[0]} holdings already indexed under {source!r}.")
+    with cols[1]:
+        save = st.button("🗂️ Save to land record index", disabled=not source)
+    if save:
+        count = store.ingest(source, details())
+        st.success(f"Indexed {count} holdings from {source}.")
+
+def search_panel():
+    with st.expander("🔎 Land Record Search"):
+        store = get_land_store()
+        by = st.radio("Search by", ["Owner", "Khewat / Marba / Killa"], horizontal=True)
+        if by == "Owner":
+            cols = st.columns([3, 1])
+            with cols[0]: name = st.text_input("Owner Name", key="search_owner")
+            with cols[1]: prefix = st.checkbox("Starts with", key="search_prefix")
+            holdings = store.owner_holdings(name, prefix=prefix) if name.strip() else None
+        else:
+            cols = st.columns(3)
+            with cols[0]: khewat = st.text_input("Khewat No", key="search_khewat")
+            with cols[1]: marba = st.text_input("Marba No", key="search_marba")
+            with cols[2]: killa = st.text_input("Killa No", key="search_killa")
+            holdings = store.plot_holdings(khewat, marba, killa) if khewat.strip() else None
+        if holdings is not None:
+            st.caption(f"{len(holdings)} holdings")
+            st.dataframe(holdings[HOLDING_COLUMNS])
+            st.dataframe(holdings_summary(holdings))
+        st.caption("Indexed files")
+        st.dataframe(store.sources())
+
+result_cache = get_result_cache()
+timer = StageTimer(enabled=st.sidebar.checkbox("Show stage timings", help="Per-stage timings for this run"))
 
 # Input mode
 input_method = st.radio("Choose input method", ["Manual Entry", "Upload Excel File"])
-data_rows = []
-df_uploaded = pd.DataFrame()
+results = pd.DataFrame()
+summary = pd.DataFrame()
+result_key = None
+streamed = None
 
 if input_method == "Upload Excel File":
     uploaded_file = st.file_uploader("Upload your Excel file (.xlsx)", type=["xlsx"])
-    if uploaded_file:
-        df_uploaded = pd.read_excel(uploaded_file)
-        st.dataframe(df_uploaded)
+    cols = st.columns(2)
+    with cols[0]: streaming = st.checkbox("Streaming mode (large files)", help="Reads the sheet in chunks; only a preview of the detailed rows is kept. Downloads recompute the full table chunk by chunk.")
+    with cols[1]: preview_rows = st.number_input("Preview rows", min_value=1, value=PREVIEW_ROWS)
+    if uploaded_file and streaming:
+        data = uploaded_file.getvalue()
+        result_key = content_key(data, "stream", preview_rows)
+        try:
+            streamed = cached(result_key, lambda: {"result": timed_stream(data, preview_rows)}, timer)["result"]
+        except KeyError as e:
+            st.error(f"Error in uploaded file: {e}")
+        else:
+            st.dataframe(streamed.preview)
+    elif uploaded_file:
+        data = uploaded_file.getvalue()
+        result_key = content_key(data)
+        entry = cached(result_key, lambda: compute_upload(data, timer), timer)
+        st.dataframe(entry["frame"].head(preview_rows))
+        if "error" in entry:
+            st.error(f"Error in uploaded file: {entry['error']}")
+        else:
+            for row_no, e in entry["errors"]:
+                st.error(f"Error in row {row_no}: {e}")
+            results, summary = entry["detail"], entry["summary"]
 
 else:
     st.subheader("Manual Land Entry")
-    num_rows = st.number_input("Number of entries", min_value=1, max_value=50, value=3)
-    for i in range(num_rows):
-        cols = st.columns(7)
-        with cols[0]: khewat = st.text_input(f"Khewat No {i+1}", key=f"khewat_{i}")
-        with cols[1]: marba = st.text_input(f"Marba No {i+1}", key=f"marba_{i}")
-        with cols[2]: killa = st.text_input(f"Killa No {i+1}", key=f"killa_{i}")
-        with cols[3]: kanal = st.number_input(f"Total Area (Kanal) {i+1}", 0.0, 1000.0, step=0.1, key=f"kanal_{i}")
-        with cols[4]: marla = st.number_input(f"Total Area (Marla) {i+1}", 0.0, 19.0, step=0.1, key=f"marla_{i}")
-        with cols[5]: owner = st.text_input(f"Owner Name {i+1}", key=f"owner_{i}")
-        with cols[6]: share_frac = st.text_input(f"Share Fraction {i+1} (e.g. 1/2)", key=f"share_{i}")
-
-        if share_frac:
-            try:
-                frac = float(Fraction(share_frac))
-                area_kanal = kanal + (marla / KANAL_TO_MARLA)
-                share_area = area_kanal * frac
-                kila, kanal_out, marla_out, sarshai_out = breakdown_area(share_area)
-                data_rows.append({
-                    "Khewat": khewat,
-                    "Marba": marba,
-                    "Killa": killa,
-                    "Owner": owner,
-                    "Share Fraction": share_frac,
-                    "Share Area (Kanal)": share_area,
-                    "Kila": kila,
-                    "Kanal": kanal_out,
-                    "Marla": marla_out,
-                    "Sarshai": sarshai_out,
-                    "Acre": round(share_area * KANAL_TO_ACRE, 3)
-                })
-            except Exception as e:
-                st.error(f"Invalid fraction in row {i+1}: {e}")
-
-# Uploaded file logic
-if not df_uploaded.empty:
-    for idx, row in df_uploaded.iterrows():
-        try:
-            kanal = float(row["Total Area (Kanals)"])
-            marla = float(row["Total Area (Marlas)"])
-            share_frac = str(row["Share Fraction"])
-            frac = float(Fraction(share_frac))
-            area_kanal = kanal + (marla / KANAL_TO_MARLA)
-            share_area = area_kanal * frac
-            kila, kanal_out, marla_out, sarshai_out = breakdown_area(share_area)
-            data_rows.append({
-                "Khewat": row["Khewat No"],
-                "Marba": row["Marba No"],
-                "Killa": row["Killa No"],
-                "Owner": row["Owner Name"],
-                "Share Fraction": share_frac,
-                "Share Area (Kanal)": share_area,
-                "Kila": kila,
-                "Kanal": kanal_out,
-                "Marla": marla_out,
-                "Sarshai": sarshai_out,
-                "Acre": round(share_area * KANAL_TO_ACRE, 3)
-            })
-        except Exception as e:
-            st.error(f"Error in row {idx+1}: {e}")
+    st.caption("Add rows at the bottom of the grid, or paste a block of rows copied from a spreadsheet.")
+    # The grid's starting data must stay the same object across reruns, or
+    # the editor would drop its edits
+    base = st.session_state.setdefault("manual_base", pd.DataFrame({
+        "Khewat No": [""] * 3,
+        "Marba No": [""] * 3,
+        "Killa No": [""] * 3,
+        "Total Area (Kanals)": [0.0] * 3,
+        "Total Area (Marlas)": [0.0] * 3,
+        "Owner Name": [""] * 3,
+        "Share Fraction": [""] * 3,
+    }))
+    grid = st.data_editor(
+        base,
+        key="manual_grid",
+        num_rows="dynamic",
+        width="stretch",
+        column_config={
+            "Total Area (Kanals)": st.column_config.NumberColumn(min_value=0.0, max_value=1000.0, step=0.01, default=0.0),
+            "Total Area (Marlas)": st.column_config.NumberColumn(min_value=0.0, max_value=19.0, step=0.01, default=0.0),
+            "Share Fraction": st.column_config.TextColumn(help="e.g. 1/2"),
+        },
+    )
+    manual = st.session_state.setdefault("manual_shares", IncrementalShares())
 
-# Output section
-if data_rows:
-    df = pd.DataFrame(data_rows)
+    # Cells cleared in the grid come back as None; treat them as zero area / no name
+    grid = grid.fillna({"Total Area (Kanals)": 0.0, "Total Area (Marlas)": 0.0, "Owner Name": ""})
+
+    with timer.stage("manual rows (changed only)"):
+        manual.sync(grid)
+        results, summary = manual.detail(), manual.summary()
+        result_key = manual.key()
+
+    errors = manual.errors
+    for i, e in errors[:MAX_ERRORS]:
+        st.error(f"Error in row {i+1}: {e}")
+    if len(errors) > MAX_ERRORS:
+        st.warning(f"{len(errors) - MAX_ERRORS} more rows had errors.")
+
+# Streamed upload output
+if streamed is not None and streamed.rows:
+    for row_no, e in streamed.errors:
+        st.error(f"Error in row {row_no}: {e}")
+    if streamed.error_count > len(streamed.errors):
+        st.warning(f"{streamed.error_count - len(streamed.errors)} more rows had errors.")
 
     st.subheader("🔍 Individual Share Calculations")
-    st.dataframe(df)
+    st.caption(f"First {len(streamed.detail_preview)} of {streamed.rows} rows")
+    st.dataframe(streamed.detail_preview)
 
     st.subheader("📊 Owner-wise Summary")
-    summary = df.groupby("Owner")["Share Area (Kanal)"].sum().reset_index()
-    summary[["Kila", "Kanal", "Marla", "Sarshai", "Acre"]] = summary["Share Area (Kanal)"].apply(
-        lambda x: pd.Series(list(breakdown_area(x)) + [round(x * KANAL_TO_ACRE, 3)])
-    )
-    st.dataframe(summary)
+    st.dataframe(streamed.summary)
+
+    download_buttons(result_key, lambda: detail_chunks(data), streamed.summary)
+    save_to_index(uploaded_file.name, lambda: detail_chunks(data))
+
+# Output section
+if not results.empty:
+    with timer.stage("render tables"):
+        st.subheader("🔍 Individual Share Calculations")
+        st.dataframe(results[DETAIL_COLUMNS])
+
+        st.subheader("📊 Owner-wise Summary")
+        st.dataframe(summary)
+
+    # Download buttons
+    download_buttons(result_key, results, summary)
+
+    report_section(result_key, results)
+
+    if input_method == "Upload Excel File":
+        save_to_index(uploaded_file.name, lambda: results)
+
+search_panel()
 
-    # Download button
-    xlsx = to_excel_bytes(df, summary)
-    st.download_button("📥 Download Results (Excel)", data=xlsx, file_name="land_share_results.xlsx")
+if timer.enabled:
+    st.sidebar.subheader("⏱️ Stage timings")
+    st.sidebar.dataframe(timer.to_frame()[["Stage", "Seconds"]], hide_index=True)
@@ -0,0 +1,145 @@
+"""Headless batch processing of village workbooks.
+
+Usage:
+    python batch.py DIR_OR_GLOB [...] -o results --workers 8
+
+Each input workbook gets a ``<name>_results.xlsx`` (prefixed with its
+directory when several inputs share a name) with the same
+'Detailed Output' and 'Owner Summary' sheets as the app, and all owners
+are merged into ``owner_summary.xlsx``. Exits non-zero if any file or row
+failed.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from engine import (
+    DETAIL_COLUMNS, SUMMARY_COLUMNS, compute_shares, merge_totals, owner_totals, summary_from_totals,
+)
+from export import write_excel
+from ingest import CHUNK_ROWS, iter_upload_chunks
+
+
+def find_workbooks(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.xlsx")
+        paths.extend(p for p in sorted(glob.glob(pattern)) if not os.path.basename(p).startswith("~$"))
+    return list(dict.fromkeys(paths))
+
+
+def output_names(paths):
+    """``<name>_results.xlsx`` for each input.
+
+    Inputs sharing a file name are told apart by their directories,
+    relative to the common parent of all inputs. Raises ``ValueError`` if
+    two inputs would still write the same file.
+    """
+    stems = [os.path.splitext(os.path.basename(p))[0] for p in paths]
+    counts = Counter(stems)
+    parent = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    names = []
+    for path, stem in zip(paths, stems):
+        if counts[stem] > 1:
+            stem = os.path.relpath(os.path.splitext(os.path.abspath(path))[0], parent).replace(os.sep, "_")
+        names.append(stem + "_results.xlsx")
+    repeated = sorted(name for name, n in Counter(names).items() if n > 1)
+    if repeated:
+        raise ValueError(f"Several inputs would write {', '.join(repeated)}")
+    return names
+
+
+def process_file(path, output, chunk_rows=CHUNK_ROWS):
+    """Compute one workbook and write its results to ``output``.
+
+    Detail chunks are written to the workbook as they are computed.
+    Returns a dict with the row count, row errors as ``(row_no, message)``,
+    the per-owner totals and the output path; a file-level failure is
+    reported in ``error``.
+    """
+    start = time.perf_counter()
+    result = {"path": path, "rows": 0, "errors": [], "totals": None, "output": None, "error": None}
+
+    def details():
+        for chunk in iter_upload_chunks(path, chunk_rows):
+            detail, errors = compute_shares(chunk, row_offset=result["rows"])
+            result["rows"] += len(chunk)
+            result["errors"].extend((row_no, str(e)) for row_no, e in errors)
+            result["totals"] = merge_totals(result["totals"], owner_totals(detail))
+            yield detail[DETAIL_COLUMNS]
+        if result["totals"] is None:
+            yield pd.DataFrame(columns=DETAIL_COLUMNS)
+
+    def summary():
+        if result["totals"] is None:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+        return summary_from_totals(result["totals"])
+
+    try:
+        write_excel(output, {"Detailed Output": details(), "Owner Summary": summary})
+        result["output"] = output
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute land shares for a directory of village workbooks.")
+    parser.add_argument("inputs", nargs="+", help="directories or glob patterns of .xlsx files")
+    parser.add_argument("-o", "--output", default="results", help="directory for result workbooks")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows read per chunk")
+    args = parser.parse_args(argv)
+
+    paths = find_workbooks(args.inputs)
+    if not paths:
+        print("No .xlsx files found.", file=sys.stderr)
+        return 2
+    try:
+        outputs = [os.path.join(args.output, name) for name in output_names(paths)]
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    os.makedirs(args.output, exist_ok=True)
+
+    start = time.perf_counter()
+    rows = failed = 0
+    totals = None
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(process_file, p, out, args.chunk_rows) for p, out in zip(paths, outputs)]
+        for future in as_completed(futures):
+            result = future.result()
+            rows += result["rows"]
+            if result["error"]:
+                failed += 1
+                print(f"{result['path']}: Error in uploaded file: {result['error']}", file=sys.stderr)
+                continue
+            for row_no, message in result["errors"]:
+                print(f"{result['path']}: Error in row {row_no}: {message}", file=sys.stderr)
+            if result["errors"]:
+                failed += 1
+            print(f"{result['path']}: {result['rows']} rows -> {result['output']} ({result['seconds']:.2f}s)")
+            totals = merge_totals(totals, result["totals"])
+
+    if totals is not None:
+        merged = summary_from_totals(totals)
+        merged_path = os.path.join(args.output, "owner_summary.xlsx")
+        write_excel(merged_path, {"Owner Summary": merged})
+        print(f"Merged owner summary: {merged_path} ({len(merged)} owners)")
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths)} files, {rows} rows in {elapsed:.2f}s "
+          f"({rows / elapsed:,.0f} rows/sec, {len(paths) / elapsed:.2f} files/sec); {failed} with errors")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
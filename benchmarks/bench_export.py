@@ -0,0 +1,77 @@
+"""Compare the write-only exporter with the previous pandas ExcelWriter one.
+
+Usage:
+    python benchmarks/bench_export.py --rows 100000 1000000
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from engine import DETAIL_COLUMNS, compute_shares, summarize_owners  # noqa: E402
+from export import parquet_available, to_csv_bytes, to_excel_bytes, to_parquet_bytes  # noqa: E402
+from synthetic import generate_upload  # noqa: E402
+
+
+def pandas_excel_bytes(df1, df2):
+    """The exporter as it was before the write-only rewrite."""
+    output = io.BytesIO()
+    writer = pd.ExcelWriter(output, engine='openpyxl')
+    df1.to_excel(writer, index=False, sheet_name='Detailed Output')
+    df2.to_excel(writer, index=False, sheet_name='Owner Summary')
+    writer.close()
+    output.seek(0)
+    return output
+
+
+def result_tables(rows, seed=0):
+    detail, _ = compute_shares(generate_upload(rows, seed))
+    return detail[DETAIL_COLUMNS], summarize_owners(detail)
+
+
+def measure(fn, memory):
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    data = fn()
+    seconds = time.perf_counter() - start
+    peak = 0
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    size = len(data.getvalue()) if hasattr(data, "getvalue") else len(data)
+    return seconds, peak, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--memory", action="store_true", help="also trace peak memory (much slower)")
+    args = parser.parse_args(argv)
+
+    for rows in args.rows:
+        detail, summary = result_tables(rows)
+        cases = [
+            ("excel (pandas ExcelWriter)", lambda: pandas_excel_bytes(detail, summary)),
+            ("excel (write-only)", lambda: to_excel_bytes(detail, summary)),
+            ("csv (both tables)", lambda: to_csv_bytes(detail) + to_csv_bytes(summary)),
+        ]
+        if parquet_available():
+            cases.append(("parquet (both tables)", lambda: to_parquet_bytes(detail) + to_parquet_bytes(summary)))
+        print(f"\n{rows:,} rows, {len(summary):,} owners")
+        for name, fn in cases:
+            seconds, peak, size = measure(fn, args.memory)
+            line = f"  {name:<28} {seconds:8.2f}s  {size / 1e6:8.1f} MB out"
+            if args.memory:
+                line += f"  {peak / 1e6:8.1f} MB peak"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
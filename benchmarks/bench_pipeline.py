@@ -0,0 +1,135 @@
+"""Per-stage timing and peak memory of the upload pipeline.
+
+Usage:
+    python benchmarks/bench_pipeline.py --sizes 1k 100k 1m
+    python benchmarks/bench_pipeline.py --save-baseline
+    python benchmarks/bench_pipeline.py --compare --tolerance 0.25
+
+Stages: ingest (pd.read_excel), parse (parse_fractions), arithmetic
+(share_sarsai and breakdown_sarsai on the parsed arrays), compute (the
+whole of compute_shares, which includes the previous two), summary (owner
+groupby) and export (to_excel_bytes). Synthetic workbooks are cached in
+benchmarks/.data so only the first run pays for generating them.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir))
+
+from engine import (  # noqa: E402
+    DETAIL_COLUMNS, FRACTION_COLUMN, KANAL_COLUMN, MARLA_COLUMN, breakdown_sarsai, compute_shares, parse_fractions,
+    scaled_area, share_sarsai, summarize_owners,
+)
+from export import to_excel_bytes  # noqa: E402
+from synthetic import parse_size, write_workbook  # noqa: E402
+from timing import StageTimer  # noqa: E402
+
+DATA_DIR = os.path.join(HERE, ".data")
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+
+
+def workbook_for(rows, seed=0):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"upload_{rows}_{seed}.xlsx")
+    if not os.path.exists(path):
+        print(f"  generating {path} ...", flush=True)
+        write_workbook(path, rows, seed)
+    return path
+
+
+def run_pipeline(path, trace_memory=True, export=True):
+    """Stage timings; with ``trace_memory`` a second, traced pass adds peaks.
+
+    Tracing slows Python code down a lot, so times always come from the
+    untraced pass.
+    """
+    frame = _run_stages(path, StageTimer(), export)
+    if trace_memory:
+        traced = _run_stages(path, StageTimer(trace_memory=True), export)
+        frame["Peak Memory (MB)"] = traced["Peak Memory (MB)"]
+    return frame
+
+
+def _run_stages(path, timer, export):
+    with timer.stage("ingest"):
+        upload = pd.read_excel(path)
+    with timer.stage("parse"):
+        _, num, den, _ = parse_fractions(upload[FRACTION_COLUMN].to_numpy())
+    kanal = pd.to_numeric(upload[KANAL_COLUMN], errors="coerce").to_numpy(float)
+    marla = pd.to_numeric(upload[MARLA_COLUMN], errors="coerce").to_numpy(float)
+    with timer.stage("arithmetic"):
+        sarsai, _ = share_sarsai(scaled_area(kanal, marla).astype("int64"), num, den)
+        breakdown_sarsai(sarsai)
+    with timer.stage("compute"):
+        detail, _ = compute_shares(upload)
+    with timer.stage("summary"):
+        summary = summarize_owners(detail)
+    if export:
+        with timer.stage("export"):
+            to_excel_bytes(detail[DETAIL_COLUMNS], summary)
+    return timer.to_frame()
+
+
+# Stages faster than this are reported but never flagged; they are all noise
+NOISE_SECONDS = 0.05
+
+
+def compare(results, baseline, tolerance):
+    """Print the change per stage; return True if any grew by more than ``tolerance``."""
+    regressed = False
+    for size, stages in results.items():
+        unit = " MB" if size.endswith("peak MB") else "s"
+        for stage, value in stages.items():
+            before = baseline.get(size, {}).get(stage)
+            if not before:
+                continue
+            change = value / before - 1
+            noise = unit == "s" and max(before, value) < NOISE_SECONDS
+            flag = "  REGRESSION" if change > tolerance and not noise else ""
+            regressed |= bool(flag)
+            print(f"  {size:>14} {stage:<10} {before:8.3f}{unit} -> {value:8.3f}{unit} ({change:+.0%}){flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the land share pipeline stage by stage.")
+    parser.add_argument("--sizes", nargs="+", default=["1k", "100k"], help="row counts, e.g. 1k 100k 1m")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced pass for peak memory")
+    parser.add_argument("--no-export", action="store_true", help="skip the Excel export stage")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {BASELINE_PATH}")
+    parser.add_argument("--compare", action="store_true", help="compare against the saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before failing")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        rows = parse_size(size)
+        print(f"\n{size} ({rows:,} rows)")
+        frame = run_pipeline(workbook_for(rows), trace_memory=not args.no_memory, export=not args.no_export)
+        print(frame.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+        results[size] = dict(zip(frame["Stage"], frame["Seconds"]))
+        if not args.no_memory:
+            results[size + " peak MB"] = dict(zip(frame["Stage"], frame["Peak Memory (MB)"]))
+
+    if args.compare:
+        with open(BASELINE_PATH) as fh:
+            baseline = json.load(fh)
+        print(f"\nCompared with baseline from {baseline.get('_machine', 'unknown machine')}:")
+        if compare(results, baseline, args.tolerance):
+            return 1
+    if args.save_baseline:
+        results["_machine"] = f"{platform.node()} / Python {platform.python_version()}"
+        with open(BASELINE_PATH, "w") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"\nSaved baseline to {BASELINE_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
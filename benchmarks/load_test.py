@@ -0,0 +1,73 @@
+"""Load test for the HTTP service.
+
+Start the service first (e.g. ``gunicorn -w 4 service:app``), then:
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 -n 2000 -c 16
+    python benchmarks/load_test.py --batch-rows 1000 -n 200
+
+Reports p50/p99 latency and requests/sec.
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+FRACTIONS = ["1/2", "1/3", "7/48", "11/240", "1/4"]
+
+
+def make_row(i):
+    return {
+        "Khewat No": 100 + i % 50,
+        "Marba No": i % 30,
+        "Killa No": i % 25,
+        "Owner Name": f"Owner {i % 200}",
+        "Total Area (Kanals)": (i % 40) * 0.25,
+        "Total Area (Marlas)": i % 20,
+        "Share Fraction": FRACTIONS[i % len(FRACTIONS)],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the land share HTTP service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("-n", "--requests", type=int, default=1000)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--batch-rows", type=int, default=0,
+                        help="rows per request to /api/shares; 0 posts single rows to /api/share")
+    args = parser.parse_args(argv)
+
+    if args.batch_rows:
+        endpoint = args.url.rstrip("/") + "/api/shares"
+        body = json.dumps([make_row(i) for i in range(args.batch_rows)]).encode()
+    else:
+        endpoint = args.url.rstrip("/") + "/api/share"
+        body = json.dumps(make_row(1)).encode()
+
+    def call(_):
+        req = urllib.request.Request(endpoint, data=body, headers={"Content-Type": "application/json"})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req) as resp:
+                resp.read()
+                ok = resp.status == 200
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(call, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(t for t, _ in results)
+    failures = sum(1 for _, ok in results if not ok)
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"{endpoint}: {args.requests} requests, concurrency {args.concurrency}, {failures} failed")
+    print(f"p50 {cuts[49] * 1000:.1f} ms  p99 {cuts[98] * 1000:.1f} ms  {args.requests / elapsed:.1f} req/s"
+          + (f"  {args.requests * args.batch_rows / elapsed:,.0f} rows/s" if args.batch_rows else ""))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
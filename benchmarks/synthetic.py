@@ -0,0 +1,94 @@
+"""Synthetic jamabandi workbooks in the ``sample_land_share_upload.xlsx`` schema.
+
+Usage:
+    python benchmarks/synthetic.py --rows 100k -o village_100k.xlsx
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from export import write_excel  # noqa: E402
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# Co-owner share patterns for one khewat; each pattern sums to 1
+SHARE_PATTERNS = [
+    ["1"],
+    ["1/2", "1/2"],
+    ["1/3", "1/3", "1/3"],
+    ["1/3", "2/3"],
+    ["1/4", "1/4", "1/2"],
+    ["7/48", "7/48", "17/24"],
+    ["11/240", "11/240", "109/120"],
+    ["7/48", "11/240", "1/3", "19/40"],
+    ["1/6", "1/6", "1/6", "1/2"],
+]
+PATTERN_WEIGHTS = np.array([6, 20, 12, 10, 10, 8, 6, 4, 4], dtype=float)
+
+
+def parse_size(text):
+    text = text.lower()
+    return SIZES[text] if text in SIZES else int(text.replace("_", ""))
+
+
+def generate_upload(rows, seed=0):
+    """A DataFrame of ``rows`` upload rows, khewat by khewat.
+
+    Every khewat's shares sum to 1: when the next pattern would run past
+    ``rows``, the remaining rows are filled with single-owner khewats.
+    """
+    rng = np.random.default_rng(seed)
+    owners = max(rows // 8, 1)
+    picks = rng.choice(len(SHARE_PATTERNS), size=rows, p=PATTERN_WEIGHTS / PATTERN_WEIGHTS.sum())
+
+    fractions, khewat = [], []
+    khewat_no = 0
+    for pick in picks:
+        pattern = SHARE_PATTERNS[pick]
+        if len(fractions) + len(pattern) > rows:
+            pattern = SHARE_PATTERNS[0]
+        khewat_no += 1
+        fractions.extend(pattern)
+        khewat.extend([khewat_no] * len(pattern))
+        if len(fractions) == rows:
+            break
+    fractions, khewat = np.array(fractions), np.array(khewat)
+
+    plot_kanal = rng.integers(0, 160, khewat_no + 1) * 0.25
+    plot_marla = rng.integers(0, 20, khewat_no + 1)
+    marba = rng.integers(1, 120, khewat_no + 1)
+    killa = rng.integers(1, 26, khewat_no + 1)
+    return pd.DataFrame({
+        "Khewat No": khewat,
+        "Marba No": marba[khewat],
+        "Killa No": killa[khewat],
+        "Total Area (Kanals)": plot_kanal[khewat],
+        "Total Area (Marlas)": plot_marla[khewat],
+        "Owner Name": np.char.add("Owner ", rng.integers(0, owners, rows).astype(str)),
+        "Share Fraction": fractions,
+    })
+
+
+def write_workbook(path, rows, seed=0):
+    frame = generate_upload(rows, seed)
+    write_excel(path, {"Sheet1": frame})
+    return frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic land share upload workbook.")
+    parser.add_argument("--rows", default="1k", help="row count or one of: " + ", ".join(SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", required=True)
+    args = parser.parse_args(argv)
+    frame = write_workbook(args.output, parse_size(args.rows), args.seed)
+    print(f"Wrote {len(frame)} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
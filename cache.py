@@ -0,0 +1,155 @@
+"""Result caching across Streamlit reruns.
+
+Uploads are cached by a hash of the file bytes in a size-bounded LRU.
+Manual entry keeps the computed rows and only recomputes rows whose
+values changed, patching the owner summary for the affected owners.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from engine import (
+    DETAIL_COLUMNS, FRACTION_COLUMN, REQUIRED_COLUMNS, SUMMARY_COLUMNS, compute_shares, merge_totals,
+    owner_totals, summary_from_totals,
+)
+
+RESULT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def content_key(data, *extra):
+    """Hash of raw bytes plus any options that change the result."""
+    h = hashlib.sha256(data)
+    h.update(repr(extra).encode())
+    return h.hexdigest()
+
+
+def _sizeof(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if hasattr(value, "__dataclass_fields__"):
+        return sum(_sizeof(getattr(value, f)) for f in value.__dataclass_fields__)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """Thread-safe LRU of result dicts, evicted by approximate byte size."""
+
+    def __init__(self, max_bytes=RESULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._store(key, entry)
+        return entry
+
+    def update(self, key, **values):
+        """Add values (e.g. export bytes) to an entry, re-accounting its size."""
+        with self._lock:
+            entry = dict(self._entries.get(key, {}))
+            entry.update(values)
+            self._store(key, entry)
+        return entry
+
+    def _store(self, key, entry):
+        self._size -= self._sizes.pop(key, 0)
+        self._entries.pop(key, None)
+        size = sum(_sizeof(v) for v in entry.values())
+        self._entries[key] = entry
+        self._sizes[key] = size
+        self._size += size
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            old, _ = self._entries.popitem(last=False)
+            self._size -= self._sizes.pop(old)
+
+
+class IncrementalShares:
+    """Computed manual-entry rows, recomputed only where the input changed.
+
+    Rows are identified by their index label in the edited grid. ``sync``
+    compares the grid with the last one it saw, computes the changed and
+    new rows in one batch and rebuilds the owner totals only for owners
+    those rows touched.
+    """
+
+    def __init__(self):
+        self._input = pd.DataFrame(columns=REQUIRED_COLUMNS)
+        self._labels = pd.Index([])  # every grid row, in grid order
+        self._detail = pd.DataFrame(columns=DETAIL_COLUMNS + ["_area"])
+        self._errors = {}     # index label -> exception
+        self._totals = pd.DataFrame(columns=["_num", "_den"], index=pd.Index([], name="Owner"))
+
+    def sync(self, frame):
+        """Bring the results up to date with ``frame`` (upload-schema columns).
+
+        Rows without a share fraction are ignored. Returns the number of
+        rows that had to be recomputed.
+        """
+        self._labels = frame.index
+        frame = frame[REQUIRED_COLUMNS]
+        fraction = frame[FRACTION_COLUMN]
+        frame = frame[fraction.notna() & (fraction.astype(str).str.strip() != "")]
+
+        old = self._input
+        common = frame.index.intersection(old.index)
+        a, b = frame.loc[common].astype(object), old.loc[common].astype(object)
+        differs = (a != b) & ~(a.isna() & b.isna())
+        changed = common[differs.any(axis=1).to_numpy()]
+        dirty = changed.append(frame.index.difference(old.index))
+        stale = changed.append(old.index.difference(frame.index))
+        self._input = frame.copy()
+        if dirty.empty and stale.empty:
+            return 0
+
+        affected = set(self._detail.loc[self._detail.index.intersection(stale), "Owner"])
+        self._detail = self._detail.drop(index=self._detail.index.intersection(stale))
+        for label in stale:
+            self._errors.pop(label, None)
+
+        if not dirty.empty:
+            batch = frame.loc[dirty]
+            detail, errors = compute_shares(batch)
+            failed = [batch.index[row_no - 1] for row_no, _ in errors]
+            self._errors.update((label, e) for label, (_, e) in zip(failed, errors))
+            detail.index = batch.index.difference(pd.Index(failed), sort=False)
+            affected.update(detail["Owner"])
+            self._detail = pd.concat([self._detail, detail]) if len(self._detail) else detail
+
+        totals = owner_totals(self._detail[self._detail["Owner"].isin(affected)])
+        keep = self._totals.drop(index=self._totals.index.intersection(list(affected)))
+        self._totals = merge_totals(keep, totals) if len(keep) else totals
+        return len(dirty)
+
+    @property
+    def errors(self):
+        """``(row position, exception)`` pairs, positions 0-based in grid order."""
+        order = {label: pos for pos, label in enumerate(self._labels)}
+        return sorted((order[label], e) for label, e in self._errors.items())
+
+    def detail(self):
+        labels = self._labels.intersection(self._detail.index, sort=False)
+        return self._detail.loc[labels, DETAIL_COLUMNS + ["_area"]].reset_index(drop=True)
+
+    def summary(self):
+        if self._totals.empty:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+        return summary_from_totals(self._totals)
+
+    def key(self):
+        hashed = pd.util.hash_pandas_object(self._input.astype(str), index=True)
+        return content_key(hashed.to_numpy().tobytes())
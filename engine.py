@@ -0,0 +1,298 @@
+"""Exact, vectorized land share arithmetic.
+
+Areas are carried as integer sarsai (1 kila = 8 kanal, 1 kanal = 20 marla,
+1 marla = 9 sarsai) so shares and breakdowns never drift through float
+rounding. Whole columns are processed at once with NumPy.
+"""
+import math
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+
+# Constants
+KANAL_TO_MARLA = 20
+MARLA_TO_SARSAI = 9
+KANAL_TO_ACRE = 0.125
+KILAS_IN_KANAL = 8
+
+SARSAI_PER_KANAL = KANAL_TO_MARLA * MARLA_TO_SARSAI
+SARSAI_PER_KILA = KILAS_IN_KANAL * SARSAI_PER_KANAL
+
+# Input areas are resolved to 1/100 of a sarsai before the share is taken,
+# which keeps decimal Kanal/Marla entries (e.g. 3.75 kanal, 12.5 marla) exact.
+AREA_SCALE = 100
+
+# Largest intermediate product kept in int64; bigger fractions fall back to
+# Python integers so the arithmetic stays exact. Shares must still come out
+# below this many sarsai.
+_INT64_SAFE = 2 ** 62
+
+# Largest accepted plot area in 1/AREA_SCALE sarsai; floats are exact below it
+_MAX_AREA = 2 ** 53
+
+# Uploaded sheet column -> output column
+INPUT_COLUMNS = {
+    "Khewat No": "Khewat",
+    "Marba No": "Marba",
+    "Killa No": "Killa",
+    "Owner Name": "Owner",
+}
+KANAL_COLUMN = "Total Area (Kanals)"
+MARLA_COLUMN = "Total Area (Marlas)"
+FRACTION_COLUMN = "Share Fraction"
+REQUIRED_COLUMNS = list(INPUT_COLUMNS) + [KANAL_COLUMN, MARLA_COLUMN, FRACTION_COLUMN]
+
+BREAKDOWN_COLUMNS = ["Kila", "Kanal", "Marla", "Sarshai"]
+DETAIL_COLUMNS = ["Khewat", "Marba", "Killa", "Owner", "Share Fraction",
+                  "Share Area (Kanal)"] + BREAKDOWN_COLUMNS + ["Acre"]
+SUMMARY_COLUMNS = ["Owner", "Share Area (Kanal)"] + BREAKDOWN_COLUMNS + ["Acre"]
+
+
+def breakdown_sarsai(sarsai):
+    """Split sarsai counts (scalar or array) into kila, kanal, marla, sarshai."""
+    kila, rem = sarsai // SARSAI_PER_KILA, sarsai % SARSAI_PER_KILA
+    kanal, rem = rem // SARSAI_PER_KANAL, rem % SARSAI_PER_KANAL
+    marla, sarshai = rem // MARLA_TO_SARSAI, rem % MARLA_TO_SARSAI
+    return kila, kanal, marla, sarshai
+
+
+def kanal_to_sarsai(share_kanal):
+    """Round an area in kanal to the nearest whole sarsai."""
+    return int(round(Fraction(share_kanal) * SARSAI_PER_KANAL))
+
+
+# Area breakdown utility
+def breakdown_area(share_kanal):
+    return tuple(int(x) for x in breakdown_sarsai(kanal_to_sarsai(share_kanal)))
+
+
+def sarsai_of(df):
+    """Recover exact sarsai counts from the breakdown columns of a result table."""
+    return (df["Kila"].to_numpy(np.int64) * SARSAI_PER_KILA
+            + df["Kanal"].to_numpy(np.int64) * SARSAI_PER_KANAL
+            + df["Marla"].to_numpy(np.int64) * MARLA_TO_SARSAI
+            + df["Sarshai"].to_numpy(np.int64))
+
+
+def plot_sarsai(detail):
+    """Total plot area of each result row, rounded to whole sarsai."""
+    return _round_div(detail["_area"].to_numpy(np.int64), AREA_SCALE)
+
+
+def parse_fractions(values):
+    """Parse share fractions, once per distinct value.
+
+    Returns the fraction strings, numerator and denominator arrays and a
+    {position: exception} dict for invalid entries. The arrays are int64
+    unless some fraction is too large for it, then Python ints (object).
+    """
+    values = pd.Series(values, dtype=object)
+    # Missing cells become "" so they get a code of their own, and an error
+    codes, uniques = pd.factorize(values.where(values.notna(), "").to_numpy())
+    uniques = np.array([str(u) for u in uniques], dtype=object)
+    text = uniques[codes]
+    nums = np.zeros(len(uniques), dtype=object)
+    dens = np.ones(len(uniques), dtype=object)
+    bad = {}
+    for i, s in enumerate(uniques):
+        if not s.strip():
+            bad[i] = ValueError("Share Fraction is empty")
+            continue
+        try:
+            f = Fraction(s)
+        except Exception as e:
+            bad[i] = e
+            continue
+        nums[i], dens[i] = f.numerator, f.denominator
+    if all(abs(n) < _INT64_SAFE and d < _INT64_SAFE for n, d in zip(nums, dens)):
+        nums, dens = nums.astype(np.int64), dens.astype(np.int64)
+    errors = {}
+    if bad:
+        for pos in np.flatnonzero(np.isin(codes, list(bad))):
+            errors[int(pos)] = bad[codes[pos]]
+    return text, nums[codes], dens[codes], errors
+
+
+def _round_div(n, d):
+    """Integer n / d rounded half to even (d > 0), elementwise."""
+    q, r = n // d, n % d
+    twice = 2 * r
+    up = (twice > d) | ((twice == d) & (q % 2 == 1))
+    return q + up.astype(q.dtype)
+
+
+def scaled_area(kanal, marla):
+    """Total plot area in 1/``AREA_SCALE`` sarsai, rounded (float64)."""
+    return np.rint((np.asarray(kanal, dtype=float) * KANAL_TO_MARLA
+                    + np.asarray(marla, dtype=float)) * MARLA_TO_SARSAI * AREA_SCALE)
+
+
+def _fits_int64(area, num, den):
+    return len(area) == 0 or (
+        num.dtype != object
+        and int(np.abs(area).max()) * int(np.abs(num).max()) < _INT64_SAFE
+        and int(den.max()) * AREA_SCALE * SARSAI_PER_KANAL < _INT64_SAFE
+    )
+
+
+def share_out_of_range(area, num, den):
+    """Rows whose share of ``area`` (scaled int64) is too large to store as sarsai."""
+    if _fits_int64(area, num, den):
+        return np.zeros(len(area), dtype=bool)
+    scaled = np.abs(area.astype(object) * num.astype(object))
+    return (scaled >= den.astype(object) * (AREA_SCALE * _INT64_SAFE)).astype(bool)
+
+
+def share_sarsai(area, num, den):
+    """Exact share of each ``area`` (int64, 1/``AREA_SCALE`` sarsai).
+
+    Returns the share in whole sarsai (int64) and in kanal (float64). Rows
+    must be in range; see ``share_out_of_range``.
+    """
+    if not _fits_int64(area, num, den):
+        area, num, den = area.astype(object), num.astype(object), den.astype(object)
+    scaled = area * num
+    divisor = den * AREA_SCALE
+    sarsai = _round_div(scaled, divisor).astype(np.int64)
+    kanal_area = (scaled / (divisor * SARSAI_PER_KANAL)).astype(float)
+    return sarsai, kanal_area
+
+
+def compute_shares(df, row_offset=0):
+    """Compute the detailed share table for an upload-schema DataFrame.
+
+    Returns ``(detail, errors)`` where ``errors`` is a list of
+    ``(row_number, exception)`` for rows that could not be computed. Row
+    numbers are 1-based positions, shifted by ``row_offset``. Besides
+    ``DETAIL_COLUMNS`` the detail has an internal ``_area`` column, the
+    plot area in 1/``AREA_SCALE`` sarsai; select ``DETAIL_COLUMNS`` for output.
+    """
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise KeyError(f"Missing columns: {', '.join(missing)}")
+
+    text, num, den, errors = parse_fractions(df[FRACTION_COLUMN].to_numpy())
+    kanal = pd.to_numeric(df[KANAL_COLUMN], errors="coerce").to_numpy(float)
+    marla = pd.to_numeric(df[MARLA_COLUMN], errors="coerce").to_numpy(float)
+    area = scaled_area(kanal, marla)
+    for pos in np.flatnonzero(~np.isfinite(area)):
+        errors.setdefault(int(pos), ValueError("Total Area must be a number"))
+    for pos in np.flatnonzero(np.abs(area) >= _MAX_AREA):
+        errors.setdefault(int(pos), ValueError("Total Area is out of range"))
+
+    ok = np.ones(len(df), dtype=bool)
+    ok[list(errors)] = False
+    area = area[ok].astype(np.int64)
+    num, den = num[ok], den[ok]
+    too_large = share_out_of_range(area, num, den)
+    if too_large.any():
+        dropped = np.flatnonzero(ok)[too_large]
+        for pos in dropped:
+            errors[int(pos)] = ValueError("Share area is out of range")
+        ok[dropped] = False
+        area, num, den = area[~too_large], num[~too_large], den[~too_large]
+
+    sarsai, kanal_area = share_sarsai(area, num, den)
+    kila, kanal_out, marla_out, sarshai_out = breakdown_sarsai(sarsai)
+
+    detail = pd.DataFrame({out: df[col].to_numpy()[ok] for col, out in INPUT_COLUMNS.items()})
+    detail["Share Fraction"] = text[ok]
+    detail["Share Area (Kanal)"] = kanal_area
+    detail["Kila"] = kila
+    detail["Kanal"] = kanal_out
+    detail["Marla"] = marla_out
+    detail["Sarshai"] = sarshai_out
+    detail["Acre"] = np.round(kanal_area * KANAL_TO_ACRE, 3)
+    detail["_area"] = area
+
+    error_list = [(pos + 1 + row_offset, errors[pos]) for pos in sorted(errors)]
+    return detail, error_list
+
+
+def summarize_owners(detail):
+    """Owner-wise totals; each owner's exact share is summed, then rounded once."""
+    return summary_from_totals(owner_totals(detail))
+
+
+def share_parts(detail):
+    """Exact share of each result row in sarsai, as numerator and denominator arrays."""
+    _, num, den, _ = parse_fractions(detail["Share Fraction"].to_numpy())
+    area = detail["_area"].to_numpy(np.int64)
+    if not _fits_int64(area, num, den):
+        area, num, den = area.astype(object), num.astype(object), den.astype(object)
+    return area * num, den * AREA_SCALE
+
+
+def _rescale(num, factor):
+    """``num * factor`` in int64 while that is exact, else in Python ints."""
+    if num.dtype != object and (len(num) == 0 or int(np.abs(num).max()) * factor < _INT64_SAFE):
+        return num * factor
+    return num.astype(object) * factor
+
+
+def _sum_by_owner(values, owners, den):
+    """Totals frame of ``values`` summed per owner, over denominator ``den``."""
+    if values.dtype != object and len(values) and int(np.abs(values).max()) * len(values) >= _INT64_SAFE:
+        values = values.astype(object)
+    codes, names = pd.factorize(owners)
+    known = codes >= 0
+    sums = pd.Series(values[known]).groupby(codes[known]).sum()
+    totals = pd.DataFrame({"_num": sums.to_numpy()}, index=pd.Index(names[sums.index], name="Owner"))
+    totals["_den"] = den
+    return totals
+
+
+def owner_totals(detail):
+    """Per-owner exact share totals in sarsai, ``_num / _den``, indexed by owner.
+
+    Shares are brought to one common denominator, the same ``_den`` for
+    every owner, so the per-owner sums are plain integer group sums.
+    """
+    scaled, divisor = share_parts(detail)
+    common = math.lcm(*(int(d) for d in pd.unique(divisor)))
+    if common >= _INT64_SAFE:
+        divisor = divisor.astype(object)
+    factor = common // divisor
+    if scaled.dtype != object and len(scaled) and int(np.abs(scaled).max()) * int(factor.max()) >= _INT64_SAFE:
+        scaled, factor = scaled.astype(object), factor.astype(object)
+    return _sum_by_owner(scaled * factor, detail["Owner"].to_numpy(), common)
+
+
+def merge_totals(totals, more):
+    """Fold the owner totals of another chunk into ``totals`` (may be None)."""
+    if totals is None:
+        return more
+    den_a = int(totals["_den"].iloc[0]) if len(totals) else 1
+    den_b = int(more["_den"].iloc[0]) if len(more) else 1
+    common = math.lcm(den_a, den_b)
+    num_a = _rescale(totals["_num"].to_numpy(), common // den_a)
+    num_b = _rescale(more["_num"].to_numpy(), common // den_b)
+    if num_a.dtype != num_b.dtype:
+        num_a, num_b = num_a.astype(object), num_b.astype(object)
+    owners = np.concatenate([totals.index.to_numpy(dtype=object), more.index.to_numpy(dtype=object)])
+    return _sum_by_owner(np.concatenate([num_a, num_b]), owners, common)
+
+
+def summary_from_totals(totals):
+    """Build the summary table, sorted by owner, from exact ``_num / _den`` totals.
+
+    Each owner's total is rounded once, so the breakdown matches the summed
+    share area rather than the sum of rounded row shares.
+    """
+    totals = totals.sort_index()
+    num = totals["_num"].to_numpy()
+    den = int(totals["_den"].iloc[0]) if len(totals) else 1
+    if den * SARSAI_PER_KANAL >= _INT64_SAFE:
+        num = num.astype(object)
+    summary = pd.DataFrame({
+        "Owner": totals.index.to_numpy(),
+        "Share Area (Kanal)": (num / (den * SARSAI_PER_KANAL)).astype(float),
+    })
+    kila, kanal, marla, sarshai = breakdown_sarsai(_round_div(num, den).astype(np.int64))
+    summary["Kila"] = kila
+    summary["Kanal"] = kanal
+    summary["Marla"] = marla
+    summary["Sarshai"] = sarshai
+    summary["Acre"] = np.round(summary["Share Area (Kanal)"].to_numpy(float) * KANAL_TO_ACRE, 3)
+    return summary
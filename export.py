@@ -0,0 +1,91 @@
+"""Result table exporters.
+
+Workbooks are written with openpyxl in write-only mode, a chunk of rows at
+a time, so no cell objects are kept for sheets that have been written.
+Every exporter takes either a DataFrame or an iterable of DataFrame chunks
+with the same columns, so a streamed upload can be written without ever
+holding its full detail table.
+"""
+import importlib.util
+import io
+
+import pandas as pd
+
+EXPORT_CHUNK_ROWS = 10_000
+
+
+def _frames(data):
+    """``data`` as an iterable of DataFrames."""
+    return [data] if isinstance(data, pd.DataFrame) else data
+
+
+def _rows(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield rows as tuples with missing values as None."""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def write_excel(target, sheets, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write ``{sheet name: DataFrame or chunks}`` to ``target`` (a path or binary file).
+
+    A sheet's value may also be a callable returning either; it is called
+    when the sheet is reached, after the sheets before it were written.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for name, data in sheets.items():
+        if callable(data):
+            data = data()
+        ws = wb.create_sheet(title=name)
+        for i, df in enumerate(_frames(data)):
+            if i == 0:
+                ws.append([str(c) for c in df.columns])
+            for row in _rows(df, chunk_rows):
+                ws.append(row)
+    wb.save(target)
+
+
+# Excel exporter
+def to_excel_bytes(df1, df2):
+    output = io.BytesIO()
+    write_excel(output, {'Detailed Output': df1, 'Owner Summary': df2})
+    output.seek(0)
+    return output
+
+
+def to_csv_bytes(data):
+    output = io.BytesIO()
+    for i, df in enumerate(_frames(data)):
+        output.write(df.to_csv(index=False, header=i == 0).encode("utf-8"))
+    return output.getvalue()
+
+
+def parquet_available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def to_parquet_bytes(data):
+    """Parquet bytes of ``data``; needs the optional pyarrow package.
+
+    Each chunk is written as its own row group using the first chunk's schema.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    output = io.BytesIO()
+    writer = None
+    for df in _frames(data):
+        mixed = df.select_dtypes(include="object").columns
+        df = df.astype({c: "string" for c in mixed})
+        if writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            writer = pq.ParquetWriter(output, table.schema)
+        else:
+            table = pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False)
+        writer.write_table(table)
+    if writer is not None:
+        writer.close()
+    return output.getvalue()
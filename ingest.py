@@ -0,0 +1,98 @@
+"""Chunked, constant-memory reading of uploaded land record workbooks.
+
+The sheet is walked with openpyxl's read-only row iterator and only the
+columns the calculator needs are kept. Each chunk is computed and folded
+into the owner totals before the next one is read.
+"""
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from engine import DETAIL_COLUMNS, REQUIRED_COLUMNS, compute_shares, merge_totals, owner_totals, summary_from_totals
+
+CHUNK_ROWS = 50_000
+PREVIEW_ROWS = 100
+MAX_ERRORS = 200
+
+
+def iter_upload_chunks(file, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrames of at most ``chunk_rows`` rows with the required columns.
+
+    ``file`` may be a path or a binary file-like object. Raises ``KeyError``
+    if the header row lacks a required column.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, ())
+        names = [str(h).strip() if h is not None else "" for h in header]
+        missing = [c for c in REQUIRED_COLUMNS if c not in names]
+        if missing:
+            raise KeyError(f"Missing columns: {', '.join(missing)}")
+        positions = [names.index(c) for c in REQUIRED_COLUMNS]
+
+        # Blank rows are kept, as pd.read_excel keeps them, so row numbers
+        # match the non-streaming path; trailing blank rows are dropped
+        chunk = []
+        blank = 0
+        for row in rows:
+            if row is None or all(v is None for v in row):
+                blank += 1
+                continue
+            chunk.extend([None] * len(positions) for _ in range(blank))
+            blank = 0
+            row = tuple(row) + (None,) * (len(names) - len(row))
+            chunk.append([row[p] for p in positions])
+            while len(chunk) >= chunk_rows:
+                yield pd.DataFrame(chunk[:chunk_rows], columns=REQUIRED_COLUMNS, dtype=object)
+                chunk = chunk[chunk_rows:]
+        if chunk:
+            yield pd.DataFrame(chunk, columns=REQUIRED_COLUMNS, dtype=object)
+    finally:
+        wb.close()
+
+
+@dataclass
+class StreamResult:
+    preview: pd.DataFrame
+    detail_preview: pd.DataFrame
+    summary: pd.DataFrame
+    rows: int = 0
+    errors: list = field(default_factory=list)
+    error_count: int = 0
+
+
+def stream_upload(file, chunk_rows=CHUNK_ROWS, preview_rows=PREVIEW_ROWS):
+    """Compute shares and owner totals chunk by chunk.
+
+    Only the first ``preview_rows`` input and result rows, the per-owner
+    totals and the first ``MAX_ERRORS`` errors are kept.
+    """
+    preview, detail_preview = [], []
+    totals = None
+    result = StreamResult(pd.DataFrame(), pd.DataFrame(), pd.DataFrame())
+
+    for chunk in iter_upload_chunks(file, chunk_rows):
+        detail, errors = compute_shares(chunk, row_offset=result.rows)
+        result.rows += len(chunk)
+        result.error_count += len(errors)
+        result.errors.extend(errors[:MAX_ERRORS - len(result.errors)])
+
+        shown = sum(len(p) for p in preview)
+        if shown < preview_rows:
+            preview.append(chunk.head(preview_rows - shown))
+        shown = sum(len(p) for p in detail_preview)
+        if shown < preview_rows:
+            detail_preview.append(detail[DETAIL_COLUMNS].head(preview_rows - shown))
+
+        totals = merge_totals(totals, owner_totals(detail))
+
+    if preview:
+        result.preview = pd.concat(preview, ignore_index=True)
+    if detail_preview:
+        result.detail_preview = pd.concat(detail_preview, ignore_index=True)
+    if totals is not None:
+        result.summary = summary_from_totals(totals)
+    return result
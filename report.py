@@ -0,0 +1,103 @@
+"""Per-owner land share report rendered from ``templates/index.html``.
+
+Owners are built one at a time while the template is being rendered, so
+the HTML is streamed in pieces and never held as one string. PDFs are
+produced with pdfkit (wkhtmltopdf) and are meant to run in a worker
+process; see ``render_pdf``.
+"""
+import functools
+import io
+import os
+import tempfile
+
+import numpy as np
+
+from engine import breakdown_sarsai, owner_totals, plot_sarsai, sarsai_of, summary_from_totals
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+TEMPLATE_NAME = "index.html"
+
+
+@functools.lru_cache(maxsize=None)
+def get_environment():
+    """Shared Jinja environment; templates are compiled once and kept."""
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(["html"]),
+        auto_reload=False,
+        cache_size=-1,
+    )
+
+
+def format_area(sarsai):
+    """'K Kila K Kanal M Marla S Sarshai' strings for an array of sarsai."""
+    parts = breakdown_sarsai(np.asarray(sarsai, dtype=np.int64))
+    out = np.char.add(parts[0].astype(str), " Kila ")
+    for value, unit in zip(parts[1:], (" Kanal ", " Marla ", " Sarshai")):
+        out = np.char.add(np.char.add(out, value.astype(str)), unit)
+    return out
+
+
+def _khewat_rows(detail):
+    """Detail table with the string columns the template shows."""
+    return detail.assign(
+        khewat_no=detail["Khewat"],
+        area_str=format_area(plot_sarsai(detail)),
+        share_fraction=detail["Share Fraction"],
+        owner_share_str=format_area(sarsai_of(detail)),
+    )
+
+
+class OwnerSections:
+    """Mapping-like ``owner -> {total_share_str, khewats}`` built lazily."""
+
+    def __init__(self, detail):
+        self.detail = detail
+
+    def items(self):
+        rows = _khewat_rows(self.detail)
+        # Owner totals are the exact summed shares, rounded once, as in the summary
+        summary = summary_from_totals(owner_totals(self.detail))
+        totals = dict(zip(summary["Owner"], format_area(sarsai_of(summary))))
+        columns = ["khewat_no", "area_str", "share_fraction", "owner_share_str"]
+        for owner, group in rows.groupby("Owner", sort=True):
+            yield owner, {
+                "total_share_str": totals[owner],
+                "khewats": group[columns].to_dict("records"),
+            }
+
+
+def iter_report_html(detail):
+    """Yield the rendered report in pieces."""
+    template = get_environment().get_template(TEMPLATE_NAME)
+    return template.generate(result=OwnerSections(detail))
+
+
+def write_report_html(detail, fh):
+    for piece in iter_report_html(detail):
+        fh.write(piece)
+
+
+def report_html_bytes(detail):
+    output = io.BytesIO()
+    for piece in iter_report_html(detail):
+        output.write(piece.encode("utf-8"))
+    return output.getvalue()
+
+
+def render_pdf(detail):
+    """Render the report and return the PDF bytes.
+
+    Runs in a worker process: the HTML is streamed to a temporary file,
+    converted by wkhtmltopdf through pdfkit, and the file is removed.
+    """
+    import pdfkit
+
+    with tempfile.NamedTemporaryFile("w", suffix=".html", encoding="utf-8", delete=False) as fh:
+        write_report_html(detail, fh)
+    try:
+        return pdfkit.from_file(fh.name, False, options={"encoding": "UTF-8", "quiet": ""})
+    finally:
+        os.remove(fh.name)
@@ -0,0 +1,137 @@
+"""Stateless HTTP API for the share calculation.
+
+Endpoints (all POST bodies use the upload column names, e.g. "Owner Name"):
+    GET  /health
+    POST /api/share    one JSON object -> {"row": {...}}
+    POST /api/shares   JSON array      -> {"rows": [...], "errors": [...], "summary": [...]}
+    POST /api/upload   multipart "file" (.xlsx) -> same as /api/shares
+
+Batch responses are streamed chunk by chunk. No state is kept between
+requests, so the app can run under any number of gunicorn workers:
+    gunicorn service:app
+"""
+import json
+import os
+
+import pandas as pd
+from flask import Flask, Response, jsonify, request
+
+from engine import DETAIL_COLUMNS, REQUIRED_COLUMNS, compute_shares, merge_totals, owner_totals, summary_from_totals
+from ingest import CHUNK_ROWS, iter_upload_chunks
+
+MAX_UPLOAD_BYTES = int(os.environ.get("LAND_SHARE_MAX_UPLOAD_MB", "50")) * 1024 * 1024
+MAX_BATCH_ROWS = int(os.environ.get("LAND_SHARE_MAX_BATCH_ROWS", "200000"))
+RESPONSE_CHUNK_ROWS = 10_000
+
+app = Flask(__name__)
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES
+
+
+class BadRequest(Exception):
+    status = 400
+
+
+class TooLarge(BadRequest):
+    status = 413
+
+
+@app.errorhandler(BadRequest)
+def bad_request(e):
+    return jsonify(error=str(e)), e.status
+
+
+@app.errorhandler(413)
+def too_large(e):
+    return jsonify(error=f"Request larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"), 413
+
+
+def _records(df):
+    return json.loads(df.to_json(orient="records"))
+
+
+def _stream_results(chunks):
+    """Stream ``{"rows": [...], "errors": [...], "summary": [...]}``.
+
+    Rows are written as each chunk is computed; errors and the owner summary
+    follow once all chunks are done.
+    """
+    yield '{"rows":['
+    rows = 0
+    errors = []
+    totals = None
+    first = True
+    for chunk in chunks:
+        detail, chunk_errors = compute_shares(chunk, row_offset=rows)
+        rows += len(chunk)
+        errors.extend({"row": row_no, "error": str(e)} for row_no, e in chunk_errors)
+        totals = merge_totals(totals, owner_totals(detail))
+        if len(detail):
+            body = detail[DETAIL_COLUMNS].to_json(orient="records")[1:-1]
+            yield body if first else "," + body
+            first = False
+    summary = summary_from_totals(totals) if totals is not None else pd.DataFrame()
+    yield '],"errors":' + json.dumps(errors)
+    yield ',"summary":' + summary.to_json(orient="records") + "}"
+
+
+def _json_chunks(records):
+    for start in range(0, len(records), RESPONSE_CHUNK_ROWS):
+        yield pd.DataFrame(records[start:start + RESPONSE_CHUNK_ROWS], columns=REQUIRED_COLUMNS)
+
+
+@app.get("/health")
+def health():
+    return jsonify(status="ok")
+
+
+@app.post("/api/share")
+def share():
+    row = request.get_json(silent=True)
+    if not isinstance(row, dict):
+        raise BadRequest("Expected a JSON object")
+    missing = [c for c in REQUIRED_COLUMNS if c not in row]
+    if missing:
+        raise BadRequest(f"Missing columns: {', '.join(missing)}")
+    detail, errors = compute_shares(pd.DataFrame([row], columns=REQUIRED_COLUMNS))
+    if errors:
+        raise BadRequest(f"Error in row 1: {errors[0][1]}")
+    return jsonify(row=_records(detail[DETAIL_COLUMNS])[0])
+
+
+@app.post("/api/shares")
+def shares():
+    records = request.get_json(silent=True)
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise BadRequest("Expected a JSON array of objects")
+    if len(records) > MAX_BATCH_ROWS:
+        raise TooLarge(f"At most {MAX_BATCH_ROWS} rows per request")
+    missing = sorted({c for r in records for c in REQUIRED_COLUMNS if c not in r})
+    if missing:
+        raise BadRequest(f"Missing columns: {', '.join(missing)}")
+    return Response(_stream_results(_json_chunks(records)), mimetype="application/json")
+
+
+@app.post("/api/upload")
+def upload():
+    file = request.files.get("file")
+    if file is None:
+        raise BadRequest('Expected a multipart "file" field')
+    # The sheet is read up front, like a /api/shares body, so the row cap can
+    # be answered with a 413 before any of the response is sent
+    chunks, rows = [], 0
+    try:
+        for chunk in iter_upload_chunks(file.stream, CHUNK_ROWS):
+            rows += len(chunk)
+            if rows > MAX_BATCH_ROWS:
+                raise TooLarge(f"At most {MAX_BATCH_ROWS} rows per request")
+            chunks.append(chunk)
+    except BadRequest:
+        raise
+    except KeyError as e:
+        raise BadRequest(e.args[0])
+    except Exception as e:
+        raise BadRequest(f"Could not read workbook: {e}")
+    return Response(_stream_results(chunks), mimetype="application/json")
+
+if __name__ == "__main__":
+    app.run()
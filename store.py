@@ -0,0 +1,199 @@
+"""Persistent SQLite index of computed land shares.
+
+Every computed row is kept with its share in sarsai, indexed by
+normalized owner name and by the Khewat/Marba/Killa plot, so holdings can
+be looked up across all uploaded villages without re-reading workbooks.
+Re-uploading a source (village file) upserts its rows and drops the ones
+that are no longer in it.
+"""
+import contextlib
+import math
+import os
+import re
+import sqlite3
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+
+from engine import SUMMARY_COLUMNS, sarsai_of, share_parts, summary_from_totals
+
+DEFAULT_DB_PATH = os.environ.get("LAND_SHARE_DB", "land_records.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS holdings (
+    source TEXT NOT NULL,
+    khewat TEXT NOT NULL,
+    marba TEXT NOT NULL,
+    killa TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    owner_key TEXT NOT NULL,
+    share_fraction TEXT NOT NULL,
+    share_sarsai INTEGER NOT NULL,
+    share_exact TEXT NOT NULL DEFAULT '',
+    share_kanal REAL NOT NULL,
+    generation INTEGER NOT NULL,
+    PRIMARY KEY (source, khewat, marba, killa, owner_key)
+);
+CREATE INDEX IF NOT EXISTS holdings_owner ON holdings (owner_key);
+CREATE INDEX IF NOT EXISTS holdings_plot ON holdings (khewat, marba, killa);
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    rows INTEGER NOT NULL
+);
+"""
+
+HOLDING_COLUMNS = ["Source", "Khewat", "Marba", "Killa", "Owner", "Share Fraction",
+                   "Share Area (Kanal)", "Share (Sarsai)"]
+
+_UPSERT = """
+INSERT INTO holdings (source, khewat, marba, killa, owner, owner_key, share_fraction,
+                      share_sarsai, share_exact, share_kanal, generation)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (source, khewat, marba, killa, owner_key) DO UPDATE SET
+    owner = excluded.owner,
+    share_fraction = CASE WHEN generation = excluded.generation
+        THEN share_fraction || '+' || excluded.share_fraction ELSE excluded.share_fraction END,
+    share_sarsai = CASE WHEN generation = excluded.generation
+        THEN share_sarsai + excluded.share_sarsai ELSE excluded.share_sarsai END,
+    share_exact = CASE WHEN generation = excluded.generation
+        THEN share_exact || '+' || excluded.share_exact ELSE excluded.share_exact END,
+    share_kanal = CASE WHEN generation = excluded.generation
+        THEN share_kanal + excluded.share_kanal ELSE excluded.share_kanal END,
+    generation = excluded.generation
+"""
+
+_SELECT = """
+SELECT source, khewat, marba, killa, owner, share_fraction, share_kanal, share_sarsai,
+       COALESCE(NULLIF(share_exact, ''), share_sarsai), owner_key
+FROM holdings
+"""
+
+
+def normalize_owner(name):
+    """Case- and whitespace-insensitive key for owner names."""
+    return re.sub(r"\s+", " ", str(name)).strip().casefold()
+
+
+def _plot_value(value):
+    """Plot numbers as text; whole floats from Excel lose their '.0'."""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+class LandStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(holdings)")}
+            if "share_exact" not in columns:
+                # Indexes written before exact shares were kept fall back to share_sarsai
+                conn.execute("ALTER TABLE holdings ADD COLUMN share_exact TEXT NOT NULL DEFAULT ''")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # One short-lived connection per call keeps the store safe to share
+        # between Streamlit sessions and worker threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def ingest(self, source, details):
+        """Upsert computed detail tables for ``source`` in one transaction.
+
+        ``details`` is a DataFrame or an iterable of chunks. Rows of the
+        source that are not in this upload are removed. Returns the number
+        of holdings stored.
+        """
+        if isinstance(details, pd.DataFrame):
+            details = [details]
+        with self._connect() as conn:
+            row = conn.execute("SELECT generation FROM sources WHERE source = ?", (source,)).fetchone()
+            generation = row[0] + 1 if row else 1
+            for detail in details:
+                conn.executemany(_UPSERT, self._records(source, detail, generation))
+            conn.execute("DELETE FROM holdings WHERE source = ? AND generation != ?", (source, generation))
+            count = conn.execute("SELECT COUNT(*) FROM holdings WHERE source = ?", (source,)).fetchone()[0]
+            conn.execute(
+                "INSERT INTO sources (source, generation, rows) VALUES (?, ?, ?) "
+                "ON CONFLICT (source) DO UPDATE SET generation = excluded.generation, rows = excluded.rows",
+                (source, generation, count),
+            )
+        return count
+
+    @staticmethod
+    def _records(source, detail, generation):
+        # An owner listed twice on one plot in the same upload holds the sum
+        # of both shares; see the CASE clauses in _UPSERT
+        owners = detail["Owner"].astype(str).str.strip()
+        scaled, divisor = share_parts(detail)
+        common = np.gcd(scaled, divisor)
+        exact = [f"{n}/{d}" for n, d in zip((scaled // common).tolist(), (divisor // common).tolist())]
+        return zip(
+            [source] * len(detail),
+            map(_plot_value, detail["Khewat"]),
+            map(_plot_value, detail["Marba"]),
+            map(_plot_value, detail["Killa"]),
+            owners,
+            map(normalize_owner, owners),
+            detail["Share Fraction"].astype(str),
+            sarsai_of(detail).tolist(),
+            exact,
+            detail["Share Area (Kanal)"].astype(float).tolist(),
+            [generation] * len(detail),
+        )
+
+    def sources(self):
+        with self._connect() as conn:
+            return pd.read_sql_query("SELECT source AS Source, rows AS Rows FROM sources ORDER BY source", conn)
+
+    def _query(self, where, params):
+        with self._connect() as conn:
+            rows = conn.execute(_SELECT + where + " ORDER BY source, khewat, marba, killa", params).fetchall()
+        return pd.DataFrame(rows, columns=HOLDING_COLUMNS + ["_share", "_owner_key"])
+
+    def owner_holdings(self, name, prefix=False):
+        """All holdings of an owner; ``prefix`` matches names starting with ``name``."""
+        key = normalize_owner(name)
+        if prefix:
+            # A range scan keeps the owner index usable, unlike LIKE
+            return self._query("WHERE owner_key >= ? AND owner_key < ?", (key, key + "\U0010ffff"))
+        return self._query("WHERE owner_key = ?", (key,))
+
+    def plot_holdings(self, khewat, marba=None, killa=None):
+        """All owners of a khewat, optionally narrowed to a marba and killa."""
+        where, params = "WHERE khewat = ?", [_plot_value(khewat)]
+        for column, value in (("marba", marba), ("killa", killa)):
+            if value not in (None, ""):
+                where += f" AND {column} = ?"
+                params.append(_plot_value(value))
+        return self._query(where, params)
+
+
+def holdings_summary(holdings):
+    """Owner-wise totals of a holdings query, in the app's summary layout.
+
+    Holdings are grouped by normalized owner name, shown as the first
+    spelling found. Each holding's exact share (``_share``, a '+'-joined
+    list of fractions of a sarsai) is summed per owner and rounded once.
+    """
+    if holdings.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    shares = holdings["_share"].map(lambda text: sum(Fraction(p) for p in str(text).split("+")))
+    names = holdings.groupby("_owner_key")["Owner"].first()
+    exact = shares.groupby(holdings["_owner_key"]).sum()
+    exact.index = names[exact.index].to_numpy()
+    common = math.lcm(*(f.denominator for f in exact))
+    totals = pd.DataFrame({"_num": [f.numerator * (common // f.denominator) for f in exact]},
+                          index=pd.Index(exact.index, name="Owner"), dtype=object)
+    totals["_den"] = common
+    return summary_from_totals(totals)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from cache import IncrementalShares, ResultCache
+from engine import DETAIL_COLUMNS, REQUIRED_COLUMNS, compute_shares, summarize_owners
+
+FRACTIONS = ["1/2", "1/3", "2/3", "1/7", "1", "", "x"]
+
+
+def random_row(rng):
+    return {
+        "Khewat No": str(rng.integers(5)),
+        "Marba No": "1",
+        "Killa No": str(rng.integers(3)),
+        "Total Area (Kanals)": rng.integers(0, 40) / 4,
+        "Total Area (Marlas)": float(rng.integers(0, 20)),
+        "Owner Name": f"Owner {rng.integers(6)}",
+        "Share Fraction": FRACTIONS[rng.integers(len(FRACTIONS))],
+    }
+
+
+def full_recompute(grid):
+    frame = grid[REQUIRED_COLUMNS]
+    frame = frame[frame["Share Fraction"].str.strip() != ""]
+    detail, errors = compute_shares(frame)
+    return detail, summarize_owners(detail), errors
+
+
+def test_incremental_sync_matches_full_recompute():
+    rng = np.random.default_rng(0)
+    grid = pd.DataFrame([random_row(rng) for _ in range(8)])
+    shares = IncrementalShares()
+    next_label = len(grid)
+    for _ in range(60):
+        action = rng.integers(3)
+        if action == 0 and len(grid):
+            grid = grid.drop(index=grid.index[rng.integers(len(grid))])
+        elif action == 1:
+            grid.loc[next_label] = pd.Series(random_row(rng))
+            next_label += 1
+        elif len(grid):
+            grid.loc[grid.index[rng.integers(len(grid))]] = pd.Series(random_row(rng))
+        shares.sync(grid)
+
+        detail, summary, errors = full_recompute(grid)
+        pd.testing.assert_frame_equal(shares.detail()[DETAIL_COLUMNS], detail[DETAIL_COLUMNS], check_dtype=False)
+        pd.testing.assert_frame_equal(shares.summary(), summary, check_dtype=False)
+        assert [type(e) for _, e in shares.errors] == [type(e) for _, e in errors]
+
+
+def test_sync_recomputes_only_changed_rows():
+    rng = np.random.default_rng(1)
+    grid = pd.DataFrame([random_row(rng) for _ in range(5)])
+    shares = IncrementalShares()
+    assert shares.sync(grid) == (grid["Share Fraction"] != "").sum()
+    assert shares.sync(grid) == 0
+    grid.loc[grid.index[0], "Share Fraction"] = "3/4"
+    assert shares.sync(grid) == 1
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(max_bytes=2500)
+    cache.put("a", {"data": b"x" * 1000})
+    cache.put("b", {"data": b"x" * 1000})
+    assert cache.get("a") is not None  # "a" is now the most recently used
+    cache.put("c", {"data": b"x" * 1000})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    # update() re-accounts the entry's size
+    cache.update("c", more=b"x" * 1000)
+    assert cache.get("a") is None
+    assert set(cache.get("c")) == {"data", "more"}
+
+    # An entry larger than the whole budget is still kept on its own
+    cache.put("big", {"data": b"x" * 10_000})
+    assert cache.get("big") is not None and cache.get("c") is None
@@ -0,0 +1,120 @@
+import os
+from fractions import Fraction
+
+import pandas as pd
+
+from engine import (
+    AREA_SCALE, KANAL_TO_MARLA, MARLA_TO_SARSAI, breakdown_area, compute_shares, merge_totals,
+    owner_totals, parse_fractions, sarsai_of, summarize_owners, summary_from_totals,
+)
+
+SAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, "sample_land_share_upload.xlsx")
+
+
+def upload(*rows):
+    return pd.DataFrame(
+        [
+            {"Khewat No": 1, "Marba No": 2, "Killa No": 3, "Owner Name": owner,
+             "Total Area (Kanals)": kanal, "Total Area (Marlas)": marla, "Share Fraction": frac}
+            for owner, kanal, marla, frac in rows
+        ],
+        dtype=object,
+    )
+
+
+def breakdowns(detail):
+    return detail[["Kila", "Kanal", "Marla", "Sarshai"]].values.tolist()
+
+
+def test_sample_upload():
+    detail, errors = compute_shares(pd.read_excel(SAMPLE))
+    assert errors == []
+    assert detail["Owner"].tolist() == ["Muhammad Ali", "Ahmed Khan", "Fatima Bibi", "Salman Khan"]
+    assert detail["Share Fraction"].tolist() == ["1/2", "1/2", "1/3", "2/3"]
+    assert detail["Share Area (Kanal)"].tolist() == [2.8, 2.8, 1.25, 2.5]
+    # The old float code gave 0/2/15/9 for the first row
+    assert breakdowns(detail) == [[0, 2, 16, 0], [0, 2, 16, 0], [0, 1, 5, 0], [0, 2, 10, 0]]
+    assert detail["Acre"].tolist() == [0.35, 0.35, 0.156, 0.312]
+
+    summary = summarize_owners(detail)
+    assert summary["Owner"].tolist() == ["Ahmed Khan", "Fatima Bibi", "Muhammad Ali", "Salman Khan"]
+    assert breakdowns(summary) == [[0, 2, 16, 0], [0, 1, 5, 0], [0, 2, 16, 0], [0, 2, 10, 0]]
+
+
+def test_carry_into_next_unit():
+    # float breakdown of 5.6 kanal used to give 11 marla 9 sarshai
+    detail, _ = compute_shares(upload(("A", 5, 12, "1"), ("B", 16, 0, "1/2")))
+    assert breakdowns(detail) == [[0, 5, 12, 0], [1, 0, 0, 0]]
+    assert breakdown_area(5.6) == (0, 5, 12, 0)
+    assert breakdown_area(2.8) == (0, 2, 16, 0)
+
+
+def test_decimal_areas():
+    detail, errors = compute_shares(upload(
+        ("A", 3.75, 0, "1/3"),   # 675 sarsai / 3
+        ("B", 0.1, 0, "1"),      # 18 sarsai
+        ("C", 0, 2.5, "1"),      # 22.5 sarsai, rounded half to even
+        ("D", 1, 0.5, "1/7"),    # 184.5 / 7 = 26.36 sarsai
+    ))
+    assert errors == []
+    assert sarsai_of(detail).tolist() == [225, 18, 22, 26]
+    assert breakdowns(detail)[0] == [0, 1, 5, 0]
+    assert detail["_area"].tolist() == [67500, 1800, 2250, 18450]
+
+
+def test_large_fraction_falls_back_to_python_ints():
+    num, den = 10 ** 20 + 1, 2 * 10 ** 20 + 1
+    _, nums, _, _ = parse_fractions([f"{num}/{den}"])
+    assert nums.dtype == object
+
+    detail, errors = compute_shares(upload(("A", 5, 12, f"{num}/{den}"), ("B", 5, 12, "1/2")))
+    assert errors == []
+    area = (5 * KANAL_TO_MARLA + 12) * MARLA_TO_SARSAI * AREA_SCALE
+    assert sarsai_of(detail).tolist() == [round(Fraction(area * num, den * AREA_SCALE)), 504]
+
+
+def test_error_rows_are_numbered_with_offset():
+    detail, errors = compute_shares(
+        upload(("A", 5, 0, "1/2"), ("B", 5, 0, "x/2"), ("C", "abc", 0, "1/2"), ("D", 5, 0, "1/0")),
+        row_offset=10,
+    )
+    assert detail["Owner"].tolist() == ["A"]
+    assert [row for row, _ in errors] == [12, 13, 14]
+    assert isinstance(errors[0][1], ValueError)
+    assert "Total Area" in str(errors[1][1])
+    assert isinstance(errors[2][1], ZeroDivisionError)
+
+
+def test_blank_fractions_are_errors():
+    detail, errors = compute_shares(upload(("A", 5, 0, "1/2"), ("B", 5, 0, None), ("C", 5, 0, float("nan")),
+                                           ("D", 5, 0, "  ")))
+    assert detail["Owner"].tolist() == ["A"]
+    assert [row for row, _ in errors] == [2, 3, 4]
+    assert all("empty" in str(e) for _, e in errors)
+
+    detail, errors = compute_shares(upload(("A", 5, 0, None)))
+    assert detail.empty
+    assert [row for row, _ in errors] == [1]
+
+
+def test_out_of_range_rows_are_errors():
+    detail, errors = compute_shares(upload(
+        ("A", 8, 0, "1e30"), ("B", 0, 0, "1e30"), ("C", 1e17, 0, "1/2"), ("D", 8, 0, "1/2"),
+    ))
+    assert detail["Owner"].tolist() == ["B", "D"]
+    assert sarsai_of(detail).tolist() == [0, 720]
+    assert [(row, str(e)) for row, e in errors] == [
+        (1, "Share area is out of range"), (3, "Total Area is out of range"),
+    ]
+
+
+def test_owner_summary_rounds_the_summed_share_once():
+    # Each row is 4.5 sarsai (rounded to 4); the owner holds 13.5 -> 14
+    detail, _ = compute_shares(upload(("A", 0, 1, "1/2"), ("A", 0, 1, "1/2"), ("A", 0, 1, "1/2"), ("B", 0, 1, "1/7")))
+    assert sarsai_of(detail).tolist() == [4, 4, 4, 1]
+    summary = summarize_owners(detail)
+    assert summary["Share Area (Kanal)"].tolist()[0] == 0.075
+    assert breakdowns(summary) == [[0, 0, 1, 5], [0, 0, 0, 1]]
+
+    merged = merge_totals(owner_totals(detail.iloc[:2]), owner_totals(detail.iloc[2:]))
+    assert summary_from_totals(merged).equals(summary)
@@ -0,0 +1,31 @@
+import io
+
+import pandas as pd
+
+from engine import compute_shares
+from export import to_csv_bytes, to_excel_bytes
+
+UPLOAD = pd.DataFrame({
+    "Khewat No": [1, 1, 2],
+    "Marba No": [10, 10, 11],
+    "Killa No": [1, 1, 2],
+    "Owner Name": ["A", "B", "A"],
+    "Total Area (Kanals)": [8, 8, 4],
+    "Total Area (Marlas)": [0, 0, 10],
+    "Share Fraction": ["1/2", "1/2", "1/3"],
+})
+
+
+def chunks(df, size):
+    return (df.iloc[i:i + size] for i in range(0, len(df), size))
+
+
+def test_chunked_exports_match_whole_table():
+    detail, _ = compute_shares(UPLOAD)
+    assert to_csv_bytes(chunks(detail, 2)) == to_csv_bytes(detail)
+
+    whole = pd.read_excel(to_excel_bytes(detail, detail.head(1)), sheet_name=None)
+    chunked = pd.read_excel(to_excel_bytes(chunks(detail, 1), detail.head(1)), sheet_name=None)
+    assert list(chunked) == ["Detailed Output", "Owner Summary"]
+    for name in whole:
+        pd.testing.assert_frame_equal(chunked[name], whole[name])
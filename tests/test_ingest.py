@@ -0,0 +1,35 @@
+import io
+
+import pandas as pd
+from openpyxl import Workbook
+
+from engine import REQUIRED_COLUMNS, compute_shares
+from ingest import iter_upload_chunks, stream_upload
+
+
+def workbook(*rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(REQUIRED_COLUMNS)
+    for row in rows:
+        ws.append(row)
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+def test_streaming_row_numbers_match_read_excel():
+    data = workbook(
+        [1, 1, 1, "A", 8, 0, "1/2"],
+        [None] * 7,
+        [None] * 7,
+        [1, 1, 2, "B", 8, 0, "x"],
+        [1, 1, 3, "C", 8, 0, "1/4"],
+        [None] * 7,
+    )
+    _, expected = compute_shares(pd.read_excel(io.BytesIO(data)))
+    streamed = stream_upload(io.BytesIO(data), chunk_rows=2)
+
+    assert [row for row, _ in streamed.errors] == [row for row, _ in expected] == [2, 3, 4]
+    assert streamed.rows == sum(len(c) for c in iter_upload_chunks(io.BytesIO(data), 2)) == 5
+    assert streamed.summary["Owner"].tolist() == ["A", "C"]
@@ -0,0 +1,119 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+import service
+
+
+def row(owner="A", kanal=0, marla=1, fraction="1/2"):
+    return {"Khewat No": 1, "Marba No": 2, "Killa No": 3, "Owner Name": owner,
+            "Total Area (Kanals)": kanal, "Total Area (Marlas)": marla, "Share Fraction": fraction}
+
+
+def workbook(rows):
+    buf = io.BytesIO()
+    pd.DataFrame(rows).to_excel(buf, index=False)
+    buf.seek(0)
+    return buf
+
+
+@pytest.fixture
+def client():
+    return service.app.test_client()
+
+
+def test_health(client):
+    assert client.get("/health").get_json() == {"status": "ok"}
+
+
+def test_share(client):
+    response = client.post("/api/share", json=row(kanal=1, marla=0))
+    assert response.status_code == 200
+    result = response.get_json()["row"]
+    assert result["Owner"] == "A"
+    assert [result[c] for c in ("Kila", "Kanal", "Marla", "Sarshai")] == [0, 0, 10, 0]
+
+
+@pytest.mark.parametrize("body, error", [
+    ([row()], "Expected a JSON object"),
+    ({"Owner Name": "A"}, "Missing columns: Khewat No"),
+    (row(fraction=""), "Error in row 1: Share Fraction is empty"),
+    (row(fraction=None), "Error in row 1: Share Fraction is empty"),
+    (row(fraction="1e30"), "Error in row 1: Share area is out of range"),
+    (row(fraction="x/2"), "Error in row 1"),
+])
+def test_share_rejects_bad_rows(client, body, error):
+    response = client.post("/api/share", json=body)
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith(error)
+
+
+def test_shares_streams_rows_errors_and_summary(client):
+    # Three 1/2 shares of a marla are 13.5 sarsai, rounded once to 14
+    body = [row(), row(fraction=""), row(), row(fraction="abc"), row()]
+    response = client.post("/api/shares", json=body)
+    assert response.status_code == 200
+    result = json.loads(response.get_data(as_text=True))
+    assert len(result["rows"]) == 3
+    assert [e["row"] for e in result["errors"]] == [2, 4]
+    assert result["errors"][0]["error"] == "Share Fraction is empty"
+    assert [(s["Owner"], s["Marla"], s["Sarshai"]) for s in result["summary"]] == [("A", 1, 5)]
+
+
+def test_shares_spans_response_chunks(client, monkeypatch):
+    monkeypatch.setattr(service, "RESPONSE_CHUNK_ROWS", 2)
+    response = client.post("/api/shares", json=[row(owner=o) for o in "ABCBA"] + [row(fraction="")])
+    result = json.loads(response.get_data(as_text=True))
+    assert [r["Owner"] for r in result["rows"]] == list("ABCBA")
+    assert result["errors"] == [{"row": 6, "error": "Share Fraction is empty"}]
+    assert [s["Owner"] for s in result["summary"]] == ["A", "B", "C"]
+
+
+def test_shares_rejects_bad_bodies(client, monkeypatch):
+    assert client.post("/api/shares", json=row()).status_code == 400
+    assert client.post("/api/shares", data="[", content_type="application/json").status_code == 400
+    response = client.post("/api/shares", json=[row(), {"Owner Name": "B"}])
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("Missing columns:")
+
+    monkeypatch.setattr(service, "MAX_BATCH_ROWS", 2)
+    response = client.post("/api/shares", json=[row()] * 3)
+    assert response.status_code == 413
+    assert response.get_json() == {"error": "At most 2 rows per request"}
+
+
+def test_upload(client):
+    data = {"file": (workbook([row(), row(owner="B", fraction="")]), "village.xlsx")}
+    response = client.post("/api/upload", data=data)
+    assert response.status_code == 200
+    result = json.loads(response.get_data(as_text=True))
+    assert [r["Owner"] for r in result["rows"]] == ["A"]
+    assert result["errors"] == [{"row": 2, "error": "Share Fraction is empty"}]
+
+
+def test_upload_rejects_bad_files(client, monkeypatch):
+    response = client.post("/api/upload", data={})
+    assert response.status_code == 400
+    assert response.get_json()["error"] == 'Expected a multipart "file" field'
+
+    response = client.post("/api/upload", data={"file": (io.BytesIO(b"not a workbook"), "x.xlsx")})
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("Could not read workbook")
+
+    rows = [{k: v for k, v in row().items() if k != "Share Fraction"}]
+    response = client.post("/api/upload", data={"file": (workbook(rows), "x.xlsx")})
+    assert response.status_code == 400
+    assert "Share Fraction" in response.get_json()["error"]
+
+    monkeypatch.setattr(service, "MAX_BATCH_ROWS", 2)
+    response = client.post("/api/upload", data={"file": (workbook([row()] * 3), "x.xlsx")})
+    assert response.status_code == 413
+
+
+def test_upload_size_limit(client, monkeypatch):
+    monkeypatch.setitem(service.app.config, "MAX_CONTENT_LENGTH", 100)
+    response = client.post("/api/upload", data={"file": (io.BytesIO(b"x" * 1000), "x.xlsx")})
+    assert response.status_code == 413
+    assert "error" in response.get_json()
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from engine import compute_shares
+from store import LandStore, holdings_summary, normalize_owner
+
+
+def detail(*rows):
+    frame = pd.DataFrame(
+        [
+            {"Khewat No": khewat, "Marba No": 7, "Killa No": killa, "Owner Name": owner,
+             "Total Area (Kanals)": 0, "Total Area (Marlas)": 1, "Share Fraction": fraction}
+            for owner, khewat, killa, fraction in rows
+        ],
+        dtype=object,
+    )
+    return compute_shares(frame)[0]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LandStore(str(tmp_path / "land.db"))
+
+
+def test_reingest_replaces_rows_missing_from_the_new_upload(store):
+    assert store.ingest("village", detail(("A", 1, 1, "1/2"), ("B", 1, 1, "1/2"), ("C", 2, 1, "1"))) == 3
+    assert store.ingest("village", detail(("A", 1, 1, "1"))) == 1
+    assert store.plot_holdings(1)["Owner"].tolist() == ["A"]
+    assert store.plot_holdings(2).empty
+    assert store.sources().to_dict("records") == [{"Source": "village", "Rows": 1}]
+
+    # Another source is left alone
+    store.ingest("other", detail(("C", 2, 1, "1")))
+    store.ingest("village", detail(("B", 1, 1, "1")))
+    assert store.owner_holdings("c")["Source"].tolist() == ["other"]
+
+
+def test_duplicate_owner_rows_on_one_plot_are_summed(store):
+    # 4.5 sarsai each: the holding is 9, not the 4 + 4 of the rounded rows
+    assert store.ingest("village", detail(("A", 1, 1, "1/2"), ("A", 1, 1, "1/2"))) == 1
+    holding = store.owner_holdings("A").iloc[0]
+    assert holding["Share Fraction"] == "1/2+1/2"
+    assert holding["Share Area (Kanal)"] == pytest.approx(0.05)
+    assert holding["_share"] == "9/2+9/2"
+    assert holdings_summary(store.owner_holdings("A"))["Marla"].tolist() == [1]
+
+    # Re-ingesting does not add to the previous upload's share
+    store.ingest("village", detail(("A", 1, 1, "1/2")))
+    assert store.owner_holdings("A").iloc[0]["Share Fraction"] == "1/2"
+
+
+def test_owner_lookup_is_normalized_and_prefix_searchable(store):
+    store.ingest("village", detail(("Muhammad  Ali", 1, 1, "1/2"), ("muhammad ali", 2, 1, "1/2"),
+                                   ("Muhammad Aslam", 3, 1, "1"), ("Ahmed", 4, 1, "1")))
+    assert normalize_owner("  MUHAMMAD   ali ") == "muhammad ali"
+    assert store.owner_holdings("MUHAMMAD ALI")["Khewat"].tolist() == ["1", "2"]
+    assert store.owner_holdings("muhammad", prefix=True)["Khewat"].tolist() == ["1", "2", "3"]
+    assert store.owner_holdings("muhammad").empty
+
+    summary = holdings_summary(store.owner_holdings("muhammad", prefix=True))
+    assert summary["Owner"].tolist() == ["Muhammad  Ali", "Muhammad Aslam"]
+    assert summary["Marla"].tolist() == [1, 1]
@@ -0,0 +1,45 @@
+"""Per-stage wall-clock (and optional peak memory) measurement."""
+import contextlib
+import time
+import tracemalloc
+
+import pandas as pd
+
+
+class StageTimer:
+    """Collects ``(stage, seconds, peak bytes)`` for each timed block.
+
+    A disabled timer does nothing, so call sites can stay instrumented.
+    Peak memory uses tracemalloc, which slows Python-heavy stages down
+    noticeably; only turn it on for benchmarks.
+    """
+
+    def __init__(self, enabled=True, trace_memory=False):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.stages = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            if tracing:
+                tracemalloc.stop()
+            self.stages.append((name, seconds, peak))
+
+    def to_frame(self):
+        frame = pd.DataFrame(self.stages, columns=["Stage", "Seconds", "Peak Memory (MB)"])
+        frame["Peak Memory (MB)"] = frame["Peak Memory (MB)"].astype(float) / 1e6
+        return frame